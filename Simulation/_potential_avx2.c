@@ -0,0 +1,187 @@
+/*
+ * C equivalent of the Numba CPU kernel in gravitational_potential.py, which evaluates the gravitational potential per
+ * unit mass over a grid with AVX2 and FMA intrinsics, 8 grid points at a time. It is built by compile_kernels.py and
+ * offered as the "avx2" backend of gravity_potential. Builds without AVX2 support, such as on non-x86 CPUs, fall back
+ * to the scalar loop.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <math.h>
+#include <string.h>
+
+#ifdef __AVX2__
+#include <immintrin.h>
+#endif
+
+/* Relative tolerance within which the y-axis has to be symmetric about y = 0 for the grid to be mirrored */
+#define SYMMETRY_TOLERANCE 1e-6f
+
+#ifdef __AVX2__
+/*
+ * Approximates 1 / sqrt(r) for 8 values at once. The approximate reciprocal square root instruction is only accurate to
+ * about 12 bits, so it is followed by a single Newton-Raphson step to bring it close to full float32 precision. Where
+ * r is 0 or infinite, the step computes 0 * inf, so the estimate, which is already exact there, is kept instead. This
+ * gives -inf at a grid point on one of the masses, as in the scalar loop and the other backends.
+ */
+static inline __m256 reciprocal_sqrt(__m256 r)
+{
+    const __m256 half = _mm256_set1_ps(0.5f);
+    const __m256 three_halves = _mm256_set1_ps(1.5f);
+    __m256 estimate = _mm256_rsqrt_ps(r);
+    __m256 half_r_estimate_squared = _mm256_mul_ps(_mm256_mul_ps(half, r), _mm256_mul_ps(estimate, estimate));
+    __m256 refined = _mm256_mul_ps(estimate, _mm256_sub_ps(three_halves, half_r_estimate_squared));
+
+    return _mm256_blendv_ps(refined, estimate, _mm256_cmp_ps(refined, refined, _CMP_UNORD_Q));
+}
+#endif
+
+/* Evaluates a single row of the grid, at a fixed y-coordinate */
+static void potential_row(const float *x_axis, Py_ssize_t columns, float y, float a, float b, float k, float gm2,
+                          float *out)
+{
+    const float y_squared = y * y;
+    Py_ssize_t j = 0;
+
+#ifdef __AVX2__
+    const __m256 a_vector = _mm256_set1_ps(a);
+    const __m256 b_vector = _mm256_set1_ps(b);
+    const __m256 k_vector = _mm256_set1_ps(k);
+    const __m256 gm2_vector = _mm256_set1_ps(gm2);
+    const __m256 y_squared_vector = _mm256_set1_ps(y_squared);
+    const __m256 zero = _mm256_setzero_ps();
+
+    for (; j + 8 <= columns; j += 8) {
+        __m256 x = _mm256_loadu_ps(x_axis + j);
+        __m256 dx1 = _mm256_sub_ps(a_vector, x);
+        __m256 dx2 = _mm256_add_ps(b_vector, x);
+        __m256 inverse_r1 = reciprocal_sqrt(_mm256_fmadd_ps(dx1, dx1, y_squared_vector));
+        __m256 inverse_r2 = reciprocal_sqrt(_mm256_fmadd_ps(dx2, dx2, y_squared_vector));
+        __m256 centrifugal = _mm256_fnmadd_ps(k_vector, _mm256_fmadd_ps(x, x, y_squared_vector), zero);
+        __m256 potential = _mm256_fnmadd_ps(gm2_vector, _mm256_add_ps(inverse_r1, inverse_r2), centrifugal);
+        _mm256_storeu_ps(out + j, potential);
+    }
+#endif
+
+    for (; j < columns; j++) {
+        float x = x_axis[j];
+        float dx1 = a - x;
+        float dx2 = b + x;
+        out[j] = -k * (x * x + y_squared) - gm2 * (1.0f / sqrtf(dx1 * dx1 + y_squared)
+                                                   + 1.0f / sqrtf(dx2 * dx2 + y_squared));
+    }
+}
+
+/*
+ * Gets a C contiguous buffer of float32 values with the given number of dimensions from an object, setting a TypeError
+ * naming the argument if the object does not provide one. Returns 0 on success and -1 on failure.
+ */
+static int get_float_buffer(PyObject *object, Py_buffer *view, int flags, int ndim, const char *name)
+{
+    if (PyObject_GetBuffer(object, view, flags | PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) {
+        PyErr_Format(PyExc_TypeError, "%s must be a C contiguous float32 array", name);
+        return -1;
+    }
+
+    size_t format_length = strlen(view->format);
+    if (view->itemsize != sizeof(float) || view->format[format_length - 1] != 'f' || view->ndim != ndim) {
+        PyBuffer_Release(view);
+        PyErr_Format(PyExc_TypeError, "%s must be a %dD float32 array", name, ndim);
+        return -1;
+    }
+
+    return 0;
+}
+
+static PyObject *potential_grid(PyObject *self, PyObject *args)
+{
+    PyObject *x_object, *y_object, *out_object;
+    Py_buffer x_buffer, y_buffer, out_buffer;
+    float a, b, k, gm2;
+
+    if (!PyArg_ParseTuple(args, "OOffffO", &x_object, &y_object, &a, &b, &k, &gm2, &out_object)) {
+        return NULL;
+    }
+
+    if (get_float_buffer(x_object, &x_buffer, PyBUF_SIMPLE, 1, "x_axis") < 0) {
+        return NULL;
+    }
+
+    if (get_float_buffer(y_object, &y_buffer, PyBUF_SIMPLE, 1, "y_axis") < 0) {
+        PyBuffer_Release(&x_buffer);
+        return NULL;
+    }
+
+    if (get_float_buffer(out_object, &out_buffer, PyBUF_WRITABLE, 2, "out") < 0) {
+        PyBuffer_Release(&x_buffer);
+        PyBuffer_Release(&y_buffer);
+        return NULL;
+    }
+
+    const float *x_axis = x_buffer.buf;
+    const float *y_axis = y_buffer.buf;
+    float *out = out_buffer.buf;
+    Py_ssize_t columns = x_buffer.shape[0];
+    Py_ssize_t rows = y_buffer.shape[0];
+
+    if (out_buffer.shape[0] != rows || out_buffer.shape[1] != columns) {
+        PyBuffer_Release(&x_buffer);
+        PyBuffer_Release(&y_buffer);
+        PyBuffer_Release(&out_buffer);
+        PyErr_SetString(PyExc_ValueError, "The shape of out does not match the lengths of the axes");
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+
+    /* The potential is even in y, so if the y-axis is symmetric about y = 0 only the rows with y >= 0 are evaluated
+     * and the rest are mirrored from them, as in the Numba kernel */
+    Py_ssize_t first_row = rows / 2;
+    for (Py_ssize_t i = 0; i < rows / 2; i++) {
+        if (fabsf(y_axis[i] + y_axis[rows - 1 - i]) > SYMMETRY_TOLERANCE * fabsf(y_axis[i])) {
+            first_row = 0;
+            break;
+        }
+    }
+
+    for (Py_ssize_t i = first_row; i < rows; i++) {
+        potential_row(x_axis, columns, y_axis[i], a, b, k, gm2, out + i * columns);
+    }
+
+    for (Py_ssize_t i = 0; i < first_row; i++) {
+        memcpy(out + i * columns, out + (rows - 1 - i) * columns, columns * sizeof(float));
+    }
+
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&x_buffer);
+    PyBuffer_Release(&y_buffer);
+    PyBuffer_Release(&out_buffer);
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef potential_avx2_methods[] = {
+    {"potential_grid", potential_grid, METH_VARARGS,
+     "potential_grid(x_axis, y_axis, a, b, k, gm2, out)\n\n"
+     "Writes the gravitational potential per unit mass over the grid spanned by the contiguous float32 axes into the "
+     "contiguous float32 output buffer, indexed as [row, column]."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef potential_avx2_module = {
+    PyModuleDef_HEAD_INIT, "_potential_avx2", NULL, -1, potential_avx2_methods
+};
+
+PyMODINIT_FUNC PyInit__potential_avx2(void)
+{
+#if defined(__AVX2__) && defined(__GNUC__)
+    /* The kernel would crash with an illegal instruction on CPUs without AVX2 or FMA, so refuse to be imported there.
+     * MSVC has no equivalent of this check */
+    __builtin_cpu_init();
+    if (!__builtin_cpu_supports("avx2") || !__builtin_cpu_supports("fma")) {
+        PyErr_SetString(PyExc_ImportError, "_potential_avx2 was built for CPUs with AVX2 and FMA support");
+        return NULL;
+    }
+#endif
+
+    return PyModule_Create(&potential_avx2_module);
+}
@@ -0,0 +1,53 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+from cython.parallel import prange
+from libc.math cimport fabsf, sqrtf
+from numpy import empty, float32
+
+
+def potential_grid(const float[::1] x_axis, const float[::1] y_axis, float a, float b, float k, float gm2):
+    """
+    Cython equivalent of the Numba CPU kernel, which evaluates the gravitational potential per unit mass over the grid
+    spanned by the two axes with OpenMP threads. It has no JIT compilation delay and does not need Numba at runtime.
+
+    :param x_axis: contiguous float32 x-coordinates of the grid columns
+    :param y_axis: contiguous float32 y-coordinates of the grid rows
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: 2D float32 array of the potential, indexed as [row, column]
+    """
+
+    cdef Py_ssize_t rows = y_axis.shape[0]
+    cdef Py_ssize_t columns = x_axis.shape[0]
+    cdef Py_ssize_t first_row = rows // 2
+    cdef Py_ssize_t i, j
+    cdef float x, y, y_squared, dx1, dx2
+    cdef float symmetry_tolerance = 1e-6
+
+    gravitational_potential = empty((rows, columns), dtype=float32)
+    cdef float[:, ::1] out = gravitational_potential
+
+    # The potential is even in y, so if the y-axis is symmetric about y = 0 only the rows with y >= 0 are evaluated
+    # and the rest are mirrored from them, as in the Numba kernel
+    for i in range(rows // 2):
+        if fabsf(y_axis[i] + y_axis[rows - 1 - i]) > symmetry_tolerance * fabsf(y_axis[i]):
+            first_row = 0
+            break
+
+    for i in prange(first_row, rows, nogil=True, schedule="static"):
+        y = y_axis[i]
+        y_squared = y * y
+        for j in range(columns):
+            x = x_axis[j]
+            dx1 = a - x
+            dx2 = b + x
+            out[i, j] = -k * (x * x + y_squared) - gm2 * (1 / sqrtf(dx1 * dx1 + y_squared)
+                                                          + 1 / sqrtf(dx2 * dx2 + y_squared))
+
+    for i in prange(first_row, nogil=True, schedule="static"):
+        for j in range(columns):
+            out[i, j] = out[rows - 1 - i, j]
+
+    return gravitational_potential
@@ -0,0 +1,102 @@
+from logging import getLogger, StreamHandler, INFO
+from numba.pycc import CC
+from os import name as os_name
+from os.path import dirname, abspath, join
+from platform import machine
+from sys import stdout
+
+from Simulation.gravitational_potential import POTENTIAL_GRID_SIGNATURE, _potential_grid
+
+
+def build_numba_kernels() -> None:
+    """
+    Compiles the Numba CPU kernel ahead of time into the Simulation.grav_kernels extension module, which
+    Simulation.gravitational_potential then offers as the "aot" backend. Importing it has no compilation delay, but code
+    compiled ahead of time is neither parallelised nor compiled with fastmath or for the native CPU, so it is much
+    slower than the JIT compiled "cpu" backend. Note that numba.pycc is deprecated.
+
+    The extension is written next to this file and has to be rebuilt whenever the kernels change.
+
+    :return: None
+    """
+
+    cc = CC("grav_kernels")
+    cc.output_dir = dirname(abspath(__file__))
+    cc.verbose = True
+    cc.export("potential_grid", POTENTIAL_GRID_SIGNATURE)(_potential_grid)
+    cc.compile()
+
+
+def build_cython_kernels() -> None:
+    """
+    Compiles the Cython CPU kernel in _potential_cython.pyx into the Simulation._potential_cython extension module,
+    which Simulation.gravitational_potential then offers as the "cython" backend. The kernel is parallelised with
+    OpenMP and compiled with aggressive optimisation flags for the CPU of the machine it is built on.
+
+    :return: None
+
+    :raise ImportError: Cython is not installed
+    """
+
+    # Cython is only needed to build this extension, so it is not a dependency of the rest of the project
+    from Cython.Build import cythonize
+    from setuptools import Extension, setup
+
+    # Fast math would otherwise let the compiler assume that there are no infinities, but the potential is -inf on the
+    # masses. MSVC cannot make that exception, so it keeps precise floating point semantics
+    simulation_directory = dirname(abspath(__file__))
+    if os_name == "nt":
+        compile_args = ["/O2", "/openmp"]
+        link_args = []
+    else:
+        compile_args = ["-O3", "-march=native", "-fopenmp", "-ffast-math", "-fno-finite-math-only"]
+        link_args = ["-fopenmp"]
+
+    extension = Extension("Simulation._potential_cython", [join(simulation_directory, "_potential_cython.pyx")],
+                          extra_compile_args=compile_args, extra_link_args=link_args)
+    setup(name="_potential_cython", ext_modules=cythonize([extension]),
+          package_dir={"Simulation": simulation_directory}, script_args=["build_ext", "--inplace"])
+
+
+def build_avx2_kernels() -> None:
+    """
+    Compiles the C kernel in _potential_avx2.c into the Simulation._potential_avx2 extension module, which
+    Simulation.gravitational_potential then offers as the "avx2" backend. On x86 CPUs the kernel is compiled with AVX2
+    and FMA instructions, and with GCC or Clang the extension refuses to be imported on CPUs that do not support them.
+    On other CPUs only its scalar loop is compiled.
+
+    :return: None
+    """
+
+    from setuptools import Extension, setup
+
+    simulation_directory = dirname(abspath(__file__))
+    x86 = machine().lower() in ("x86_64", "amd64", "i386", "i686", "x86")
+    if os_name == "nt":
+        compile_args = ["/O2"] + (["/arch:AVX2"] if x86 else [])
+    else:
+        compile_args = ["-O3"] + (["-mavx2", "-mfma"] if x86 else [])
+
+    extension = Extension("Simulation._potential_avx2", [join(simulation_directory, "_potential_avx2.c")],
+                          extra_compile_args=compile_args)
+    setup(name="_potential_avx2", ext_modules=[extension],
+          package_dir={"Simulation": simulation_directory}, script_args=["build_ext", "--inplace"])
+
+
+def main() -> None:
+    log = getLogger(__name__)
+    log.setLevel(INFO)
+    log.addHandler(StreamHandler(stdout))
+
+    build_numba_kernels()
+
+    try:
+        build_cython_kernels()
+    except ImportError:
+        log.warning("Cython is not installed, so the Cython kernel was not built")
+
+    build_avx2_kernels()
+
+
+if __name__ == "__main__":
+    main()
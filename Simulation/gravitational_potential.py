@@ -1,67 +1,513 @@
-from logging import DEBUG, Formatter, getLogger, StreamHandler
-from matplotlib.pyplot import figure, contour, colorbar, show
-from numba import njit
-from numpy import meshgrid, linspace, sqrt, array
-from sys import stdout
-from time import process_time, perf_counter
+from functools import lru_cache
+from importlib.util import find_spec
+import math
+from numba import guvectorize, njit, prange
+from numpy import (add, array, ascontiguousarray, empty, empty_like, errstate, float32, inf, linspace, multiply,
+                   newaxis, reciprocal, sqrt, subtract)
 
+# CuPy is an optional dependency that is only needed to evaluate the grid on the GPU with the "cupy" backend. It takes
+# a long time to import, so it is only imported when it is used, and here it is only checked whether it is installed
+_CUPY_INSTALLED = find_spec("cupy") is not None
 
-@njit(nogil=True)
-def gravity_potential(m1: float, m2: float, m2_orbital_radius: float,
-                      x_points: array, y_points: array) -> array:
+
+# Relative tolerance within which the y-axis has to be symmetric about y = 0 for the CPU kernel to mirror the grid. This
+# is a few float32 ulps, which allows for the rounding error in axes generated with linspace
+_SYMMETRY_TOLERANCE = float32(1e-6)
+
+# Side length of the square blocks of CUDA threads the grid is split into
+_CUDA_BLOCK_SIZE = 16
+
+# Global constants are frozen into the compiled kernels, so these keep the numerator and infinity below float32s
+_ONE = float32(1)
+_INFINITY = float32(inf)
+
+# Fast-math flags for the CPU kernels. These allow reassociation, FMA contraction and approximate functions and
+# reciprocals, but not the assumption that no value is NaN or infinite, so that the kernels can keep a grid point on
+# one of the masses at -inf like the other backends
+_FASTMATH_FLAGS = {"reassoc", "contract", "afn", "arcp", "nsz"}
+
+# Numba type signature of the CPU kernel, shared by the JIT compiler below and the ahead-of-time build script. The axes
+# are declared contiguous, as the compiler can only vectorize the loops over them if it knows they are
+POTENTIAL_GRID_SIGNATURE = "float32[:, ::1](float32[::1], float32[::1], float32, float32, float32, float32)"
+
+
+def _kernel_constants(m1: float, m2: float, m2_orbital_radius: float) -> tuple:
     """
-    Takes an array of coordinates from a numpy.meshgrid object and determines the ratio of the gravitational potential
-    and the mass of the small object at each point in the meshgrid. The ratio is used rather than the potential field
-    itself because the resulting field will be something that holds true for any small third object in the three body
-    system, rather generating a similarly shaped field but with varying values proportional to the mass of the third
-    object.
+    Validates the parameters of the 3 body system and computes the scalar constants of the gravitational potential
+    that the kernels evaluating it at individual grid points need.
 
     :param m1: Mass of the largest object in the simulated 3 body system
     :param m2: Mass of the second-largest object in the simulated 3 body system
     :param m2_orbital_radius: orbital radius of the object of mass M2
-    :param x_points: x-coordinates of the grid
-    :param y_points: y-coordinates of the grid
 
-    :return: None
+    :return: float32 distance of m1 from the barycentre, distance of m2 from the barycentre, half the square of the
+        angular frequency and the product of the gravitational constant and m2, in that order
 
     :raise ValueError: Either of the masses is non-positive or m2 is larger than m1
     """
 
     if m1 <= 0:
-        raise ValueError(f"The value of m1 was non-positive")
+        raise ValueError(f"The value of m1 was non-positive: {m1}")
 
     if m2 <= 0:
-        raise ValueError(f"The value of m2 was non-positive")
+        raise ValueError(f"The value of m2 was non-positive: {m2}")
 
     if m2 > m1:
-        raise ValueError(f" The ratio of m2 to m1 was greater than 1")
-
-    # Note that without the numba JIT compiler, the exception messages should be written with formatted strings or
-    # preferably f-strings so that the message contains the values of the parameters received that caused the
-    # exception to be thrown. The reason for the choice to avoid using string formatting is because it is not supported
-    # by Numba's JIT compiler without having to use object-mode, which is often no faster than standard Python
+        raise ValueError(f"The ratio of m2 to m1 was greater than 1: {m2 / m1}")
 
     gravitational_constant = 1
 
     # By convention,  omega is used as the variable representing angular frequency
-    omega = sqrt(gravitational_constant * (m1 + m2) / m2_orbital_radius**3)
+    omega = sqrt(gravitational_constant * (m1 + m2) / (m2_orbital_radius * m2_orbital_radius * m2_orbital_radius))
+
+    # Scalar subexpressions are computed once per call here rather than once per grid point in the kernels
+    a = m2 * m2_orbital_radius / (m1 + m2)
+    b = m1 * m2_orbital_radius / (m1 + m2)
+
+    # The field is only ever used for visualization, so the grid is evaluated in single precision. This halves the
+    # memory traffic and doubles the number of SIMD lanes, but only if every operand in the kernels is a float32, as
+    # mixing in a float64 scalar or literal promotes the whole expression back to double precision
+    return float32(a), float32(b), float32(0.5 * omega * omega), float32(gravitational_constant * m2)
 
-    gravitational_potential = -0.5 * (omega ** 2) * (x_points ** 2 + y_points ** 2) - gravitational_constant * (
-            m2 / (sqrt((m2 * m2_orbital_radius / (m1 + m2) - x_points)**2 + y_points**2))
-            + m2 / (sqrt((m1 * m2_orbital_radius / (m1 + m2) + x_points)**2 + y_points**2)))
+
+@njit(inline="always")
+def _reciprocal_sqrt(r_squared: float32) -> float32:
+    """
+    Computes 1 / sqrt(r_squared) for the CPU kernels. With approximate reciprocals allowed, the compiler evaluates this
+    with an approximate reciprocal square root refined by a Newton-Raphson step, which gives NaN rather than infinity
+    for 0, so that case is handled separately.
+
+    :param r_squared: square of the distance to one of the masses
+
+    :return: reciprocal of the distance
+    """
+
+    # Dividing by a square root rather than raising to the power of -0.5 compiles to a square root instruction even
+    # without fast-math, as in the ahead of time build, where the power would be a call to the C library's pow function
+    return _ONE / math.sqrt(r_squared) if r_squared > 0 else _INFINITY
+
+
+def _potential_grid(x_axis: array, y_axis: array, a: float32, b: float32, k: float32, gm2: float32) -> array:
+    """
+    CPU kernel evaluating the gravitational potential per unit mass over the grid spanned by the two axes.
+
+    :param x_axis: float32 x-coordinates of the grid columns
+    :param y_axis: float32 y-coordinates of the grid rows
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: 2D float32 array of the potential, indexed as [row, column]
+    """
+
+    # The grid is evaluated with explicit loops over the axes rather than array expressions over a meshgrid so that
+    # only the output grid is ever allocated, and the rows are split between threads with prange. The grid is not
+    # split into tiles, as the only inputs are the two axes, which fit in cache even for large grids, and each element
+    # of the output is only written once. Splitting the rows into tiles would instead leave too few iterations of the
+    # prange loop to keep every thread busy on grids of a few hundred rows
+    rows = y_axis.shape[0]
+    columns = x_axis.shape[0]
+    gravitational_potential = empty((rows, columns), dtype=float32)
+
+    # The potential is even in y, so if the y-axis is symmetric about y = 0 only the rows with y >= 0 are evaluated
+    # and the rest are mirrored from them, which halves the work. Each row is mirrored by the thread that evaluated it
+    # while it is still in cache, and the prange loop still spans half of the rows, which is plenty to split between
+    # the threads
+    symmetric = True
+    for i in range(rows // 2):
+        if abs(y_axis[i] + y_axis[rows - 1 - i]) > _SYMMETRY_TOLERANCE * abs(y_axis[i]):
+            symmetric = False
+            break
+    first_row = rows // 2 if symmetric else 0
+
+    for i in prange(first_row, rows):
+        y = y_axis[i]
+        y_squared = y * y
+        for j in range(columns):
+            x = x_axis[j]
+            dx1 = a - x
+            dx2 = b + x
+            r1_squared = dx1 * dx1 + y_squared
+            r2_squared = dx2 * dx2 + y_squared
+            gravitational_potential[i, j] = -k * (x * x + y_squared) - gm2 * (
+                    _reciprocal_sqrt(r1_squared) + _reciprocal_sqrt(r2_squared))
+        if rows - 1 - i < first_row:
+            gravitational_potential[rows - 1 - i, :] = gravitational_potential[i, :]
 
     return gravitational_potential
 
 
+# The compiled kernel is cached on disk, so it is only recompiled when the kernel changes
+_potential_grid_cpu = njit(POTENTIAL_GRID_SIGNATURE, nogil=True, parallel=True, fastmath=_FASTMATH_FLAGS,
+                           boundscheck=False, cache=True)(_potential_grid)
+
+
+def _potential_grid_numpy(x_axis: array, y_axis: array, a: float32, b: float32, k: float32, gm2: float32) -> array:
+    """
+    Evaluates the grid with plain numpy array operations, which needs neither a compiler nor a GPU. Every operation on
+    a full grid writes into one of two preallocated grids rather than allocating a temporary for its result.
+
+    :param x_axis: float32 x-coordinates of the grid columns
+    :param y_axis: float32 y-coordinates of the grid rows
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: 2D float32 array of the potential, indexed as [row, column]
+    """
+
+    # Broadcasting the x-axis along the rows and the y-axis along the columns yields the full grid without a meshgrid.
+    # The operations on the axes alone are cheap, as they only produce a single row or column
+    x = x_axis[newaxis, :]
+    y_squared = y_axis[:, newaxis] * y_axis[:, newaxis]
+    dx1 = a - x
+    dx2 = b + x
+
+    gravitational_potential = empty((y_axis.shape[0], x_axis.shape[0]), dtype=float32)
+    add(x * x, y_squared, out=gravitational_potential)
+    multiply(gravitational_potential, -k, out=gravitational_potential)
+
+    # The same buffer holds the squared distance, and then the potential, for each of the masses in turn. The
+    # reciprocal of a distance of 0 on one of the masses is meant to be infinite, so NumPy is kept from warning about it
+    buffer = empty_like(gravitational_potential)
+    with errstate(divide="ignore"):
+        for dx in (dx1, dx2):
+            add(dx * dx, y_squared, out=buffer)
+            sqrt(buffer, out=buffer)
+            reciprocal(buffer, out=buffer)
+            multiply(buffer, gm2, out=buffer)
+            subtract(gravitational_potential, buffer, out=gravitational_potential)
+
+    return gravitational_potential
+
+
+def _potential_point(x, y, a, b, k, gm2, out):
+    """
+    Evaluates the gravitational potential per unit mass at a single point. Both reciprocal square roots are computed
+    and combined in registers. This is compiled into a generalized ufunc below, which uses numpy broadcasting rules to
+    spread the points across a thread pool.
+
+    :param x: x-coordinate of the point
+    :param y: y-coordinate of the point
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+    :param out: single element output array the potential is written to
+
+    :return: None
+    """
+
+    y_squared = y * y
+    dx1 = a - x
+    dx2 = b + x
+    out[0] = -k * (x * x + y_squared) - gm2 * (_reciprocal_sqrt(dx1 * dx1 + y_squared)
+                                               + _reciprocal_sqrt(dx2 * dx2 + y_squared))
+
+
+@lru_cache(maxsize=1)
+def _potential_ufunc():
+    """
+    Compiles _potential_point into a generalized ufunc run on a thread pool. Compiling it when this module is imported
+    would delay every import of the module, even when another backend is used, so it is only compiled, or loaded from
+    the cache, the first time this is called.
+
+    :return: the generalized ufunc version of _potential_point
+    """
+
+    return guvectorize(["void(float32, float32, float32, float32, float32, float32, float32[:])"],
+                       "(),(),(),(),(),()->()", nopython=True, target="parallel", fastmath=_FASTMATH_FLAGS,
+                       cache=True)(_potential_point)
+
+
+def _potential_grid_ufunc(x_axis: array, y_axis: array, a: float32, b: float32, k: float32, gm2: float32) -> array:
+    """
+    Evaluates the grid with a generalized ufunc run on a thread pool, rather than with explicit prange loops.
+
+    :param x_axis: float32 x-coordinates of the grid columns
+    :param y_axis: float32 y-coordinates of the grid rows
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: 2D float32 array of the potential, indexed as [row, column]
+    """
+
+    # Broadcasting the x-axis along the rows and the y-axis along the columns yields the full grid without a meshgrid
+    return _potential_ufunc()(x_axis[newaxis, :], y_axis[:, newaxis], a, b, k, gm2)
+
+
+@lru_cache(maxsize=1)
+def _potential_cuda_kernel():
+    """
+    Defines the CUDA kernel, which is compiled on its first launch. numba.cuda and libdevice take a while to load, so
+    they are only imported the first time this is called rather than whenever this module is imported.
+
+    :return: the CUDA kernel
+    """
+
+    from numba import cuda
+    from numba.cuda.libdevice import rsqrtf
+
+    @cuda.jit(fastmath=True)
+    def potential_cuda_kernel(x_axis, y_axis, a, b, k, gm2, out):
+        """
+        CUDA kernel evaluating the gravitational potential per unit mass with one thread per grid point. The x index
+        is mapped to the fastest varying thread index so that neighbouring threads write to neighbouring memory
+        addresses.
+
+        :param x_axis: float32 x-coordinates of the grid columns
+        :param y_axis: float32 y-coordinates of the grid rows
+        :param a: distance of m1 from the barycentre
+        :param b: distance of m2 from the barycentre
+        :param k: half the square of the angular frequency
+        :param gm2: product of the gravitational constant and m2
+        :param out: 2D float32 device array the potential is written to
+
+        :return: None
+        """
+
+        j, i = cuda.grid(2)
+        if i < out.shape[0] and j < out.shape[1]:
+            x = x_axis[j]
+            y = y_axis[i]
+            y_squared = y * y
+            dx1 = a - x
+            dx2 = b + x
+            out[i, j] = -k * (x * x + y_squared) - gm2 * (rsqrtf(dx1 * dx1 + y_squared)
+                                                          + rsqrtf(dx2 * dx2 + y_squared))
+
+    return potential_cuda_kernel
+
+
+def _potential_grid_cuda(x_axis: array, y_axis: array, a: float32, b: float32, k: float32, gm2: float32) -> array:
+    """
+    Evaluates the grid on a CUDA capable GPU, which is considerably faster than the CPU for large grids. Only the two
+    axes are copied to the GPU, and only the finished grid is copied back.
+
+    :param x_axis: float32 x-coordinates of the grid columns
+    :param y_axis: float32 y-coordinates of the grid rows
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: 2D float32 array of the potential, indexed as [row, column]
+    """
+
+    from numba import cuda
+
+    rows = y_axis.shape[0]
+    columns = x_axis.shape[0]
+    gravitational_potential = cuda.device_array((rows, columns), dtype=float32)
+    threads_per_block = (_CUDA_BLOCK_SIZE, _CUDA_BLOCK_SIZE)
+    blocks_per_grid = ((columns + _CUDA_BLOCK_SIZE - 1) // _CUDA_BLOCK_SIZE,
+                       (rows + _CUDA_BLOCK_SIZE - 1) // _CUDA_BLOCK_SIZE)
+    _potential_cuda_kernel()[blocks_per_grid, threads_per_block](cuda.to_device(x_axis), cuda.to_device(y_axis),
+                                                                 a, b, k, gm2, gravitational_potential)
+
+    return gravitational_potential.copy_to_host()
+
+
+def _potential_expression(x, y, a, b, k, gm2):
+    """
+    Evaluates the gravitational potential per unit mass elementwise over arrays of coordinates, which are broadcast
+    against each other. This is fused into a single CuPy kernel below.
+
+    :param x: x-coordinates of the points
+    :param y: y-coordinates of the points
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: array of the potential at each point
+    """
+
+    y_squared = y * y
+    dx1 = a - x
+    dx2 = b + x
+
+    return -k * (x * x + y_squared) - gm2 * ((dx1 * dx1 + y_squared) ** -0.5 + (dx2 * dx2 + y_squared) ** -0.5)
+
+
+@lru_cache(maxsize=1)
+def _potential_fused():
+    """
+    Fuses _potential_expression into a single CuPy kernel. Without fusing, CuPy launches a separate kernel and
+    allocates an intermediate grid for every operation in the expression, whereas the fused version is compiled into a
+    single kernel on its first call. CuPy is only imported the first time this is called.
+
+    :return: the fused version of _potential_expression
+    """
+
+    import cupy
+
+    return cupy.fuse(_potential_expression)
+
+
+def _potential_grid_cupy(x_axis, y_axis, a: float32, b: float32, k: float32, gm2: float32):
+    """
+    Evaluates the grid on the GPU for axes that are CuPy arrays. Unlike the "cuda" backend the result is left on the
+    GPU, so the axes can be generated on the GPU as well and the only copy made is the one transferring the grid back
+    to the host when it is needed. The whole expression is evaluated in a single fused kernel.
+
+    :param x_axis: float32 CuPy array of the x-coordinates of the grid columns
+    :param y_axis: float32 CuPy array of the y-coordinates of the grid rows
+    :param a: distance of m1 from the barycentre
+    :param b: distance of m2 from the barycentre
+    :param k: half the square of the angular frequency
+    :param gm2: product of the gravitational constant and m2
+
+    :return: 2D float32 CuPy array of the potential, indexed as [row, column]
+    """
+
+    # Broadcasting the x-axis along the rows and the y-axis along the columns yields the full grid without a meshgrid
+    return _potential_fused()(x_axis[newaxis, :], y_axis[:, newaxis], a, b, k, gm2)
+
+
+# Kernels that gravity_potential can evaluate the grid with, keyed by the name of the backend
+_BACKENDS = {
+    "cpu": _potential_grid_cpu,
+    "ufunc": _potential_grid_ufunc,
+    "numpy": _potential_grid_numpy,
+    "cuda": _potential_grid_cuda,
+}
+
+if _CUPY_INSTALLED:
+    _BACKENDS["cupy"] = _potential_grid_cupy
+
+try:
+    # The kernel compiled ahead of time by compile_kernels.py has no JIT start-up cost, but it is single threaded and
+    # compiled without fastmath, so it is much slower than the "cpu" backend and has to be asked for explicitly
+    from Simulation.grav_kernels import potential_grid as _potential_grid_aot
+    _BACKENDS["aot"] = _potential_grid_aot
+except ImportError:
+    pass
+
+try:
+    # Likewise, the Cython kernel is only available once it has been built by compile_kernels.py
+    from Simulation._potential_cython import potential_grid as _potential_grid_cython
+    _BACKENDS["cython"] = _potential_grid_cython
+except ImportError:
+    pass
+
+try:
+    # Likewise for the C kernel written with AVX2 intrinsics
+    from Simulation._potential_avx2 import potential_grid as _potential_grid_avx2_into
+except ImportError:
+    pass
+else:
+    def _potential_grid_avx2(x_axis: array, y_axis: array, a: float32, b: float32, k: float32,
+                             gm2: float32) -> array:
+        """
+        Evaluates the grid with the C kernel written with AVX2 intrinsics, which computes 8 grid points at a time on a
+        single thread. The extension is compiled for the CPU it was built on, so it must be rebuilt on other machines.
+
+        :param x_axis: contiguous float32 x-coordinates of the grid columns
+        :param y_axis: contiguous float32 y-coordinates of the grid rows
+        :param a: distance of m1 from the barycentre
+        :param b: distance of m2 from the barycentre
+        :param k: half the square of the angular frequency
+        :param gm2: product of the gravitational constant and m2
+
+        :return: 2D float32 array of the potential, indexed as [row, column]
+        """
+
+        gravitational_potential = empty((y_axis.shape[0], x_axis.shape[0]), dtype=float32)
+        _potential_grid_avx2_into(x_axis, y_axis, a, b, k, gm2, gravitational_potential)
+
+        return gravitational_potential
+
+    _BACKENDS["avx2"] = _potential_grid_avx2
+
+
+def gravity_potential(m1: float, m2: float, m2_orbital_radius: float,
+                      x_axis: array, y_axis: array, backend: str = "cpu") -> array:
+    """
+    Takes the 1D x and y axes of a rectangular grid and determines the ratio of the gravitational potential and the mass
+    of the small object at each point in the grid. The ratio is used rather than the potential field
+    itself because the resulting field will be something that holds true for any small third object in the three body
+    system, rather generating a similarly shaped field but with varying values proportional to the mass of the third
+    object.
+
+    :param m1: Mass of the largest object in the simulated 3 body system
+    :param m2: Mass of the second-largest object in the simulated 3 body system
+    :param m2_orbital_radius: orbital radius of the object of mass M2
+    :param x_axis: float32 x-coordinates of the grid columns
+    :param y_axis: float32 y-coordinates of the grid rows
+    :param backend: kernel used to evaluate the grid, which is one of "cpu" for parallel loops on the CPU, "ufunc" for
+        a generalized ufunc on the CPU, "numpy" for numpy array operations on the CPU, "cython" for OpenMP loops on the
+        CPU, "avx2" for SIMD intrinsics on the CPU, "aot" for the ahead-of-time compiled Numba kernel on a single CPU
+        thread, "cuda" for a CUDA kernel on the GPU or "cupy" for CuPy on the GPU. The axes have to be CuPy arrays for
+        the "cupy" backend, in which case a CuPy array is returned. The "cupy" backend is only available if CuPy is
+        installed, and the "cython", "avx2" and "aot" backends only once they have been built by compile_kernels.py
+
+    :return: 2D array of the potential, indexed as [row, column] like the output of numpy.meshgrid
+
+    :raise ValueError: Either of the masses is non-positive, m2 is larger than m1 or the backend is unknown
+    """
+
+    if backend not in _BACKENDS:
+        raise ValueError(f"The backend {backend!r} is not one of {', '.join(_BACKENDS)}")
+
+    a, b, k, gm2 = _kernel_constants(m1, m2, m2_orbital_radius)
+
+    # The compiled kernels only accept contiguous float32 axes, and the ahead-of-time compiled kernel does not check the
+    # types of its arguments at all, so the axes are converted first. This is free for axes that are already suitable
+    if backend != "cupy":
+        x_axis = ascontiguousarray(x_axis, dtype=float32)
+        y_axis = ascontiguousarray(y_axis, dtype=float32)
+
+    return _BACKENDS[backend](x_axis, y_axis, a, b, k, gm2)
+
+
+@lru_cache(maxsize=8)
+def grid_axis(points: int, lower: float, upper: float, on_gpu: bool = False) -> array:
+    """
+    Creates evenly spaced float32 coordinates along one axis of the grid. The axes are cached so that redrawing the
+    field with new parameters of the 3 body system only has to evaluate the grid, and since the same array is returned
+    for repeated calls, it must not be modified by the caller.
+
+    :param points: number of coordinates along the axis
+    :param lower: first coordinate of the axis
+    :param upper: last coordinate of the axis
+    :param on_gpu: whether to create the axis as a CuPy array on the GPU rather than as a numpy array
+
+    :return: 1D float32 array of the coordinates
+    """
+
+    if on_gpu:
+        import cupy
+        return cupy.linspace(lower, upper, points, dtype=float32)
+
+    return linspace(lower, upper, points, dtype=float32)
+
+
 def main() -> None:
+    # The logging, timing and plotting modules are only needed when this file is run as a script, so they are imported
+    # here to keep them out of the import time of the kernels when they are used from the GUI
+    from logging import DEBUG, Formatter, getLogger, StreamHandler
+    from matplotlib.pyplot import figure, contour, colorbar, show
+    from sys import stdout
+    from time import process_time, perf_counter
+
     # Function calls for plot_gravity_potential
     large_mass = 2
     second_mass = 0.5
     orbital_radius = 1
 
-    # Defining the x,y coordinates of our plot
+    # Defining the x,y coordinates of our plot. If a GPU is available, the coordinates are generated on it so that the
+    # grid can be evaluated without copying them to the GPU first
     plot_length = 200
-    grid_x, grid_y = meshgrid(linspace(-1.5, 1.5, plot_length), linspace(-1.5, 1.5, plot_length))
+    use_gpu = _CUPY_INSTALLED
+    if use_gpu:
+        import cupy
+        use_gpu = cupy.cuda.is_available()
+    axis_x = axis_y = grid_axis(plot_length, -1.5, 1.5, use_gpu)
 
     # Configure logger, with the scope name used as the logger name
     Formatter('[%(asctime)s] p%(process)s {%(pathname)s:%(lineno)d} %(levelname)s - %(message)s', '%m-%d %H:%M:%S')
@@ -70,18 +516,31 @@ def main() -> None:
     log.addHandler(StreamHandler(stdout))
 
     # find the z-coordinate at each grid point corresponding to the gravitational potential field up to a factor of
-    # 1/m where m is the mass of the smaller third object. The time taken to do so will be logged
+    # 1/m where m is the mass of the smaller third object. The time taken to do so will be logged. The kernel is run
+    # once beforehand so that its compilation on the first call is not included in the timing, which then only brackets
+    # the evaluation of the grid itself
+    backend = "cupy" if use_gpu else "cpu"
+    gravity_potential(large_mass, second_mass, orbital_radius, axis_x, axis_y, backend=backend)
+    if use_gpu:
+        # CuPy kernels are launched asynchronously, so the GPU has to be waited on for the timing to be meaningful
+        cupy.cuda.get_current_stream().synchronize()
+
     start_elapsed = perf_counter()
     start_process = process_time()
-    grid_z = gravity_potential(large_mass, second_mass, orbital_radius, grid_x, grid_y)
+    grid_z = gravity_potential(large_mass, second_mass, orbital_radius, axis_x, axis_y, backend=backend)
+    if use_gpu:
+        cupy.cuda.get_current_stream().synchronize()
     end_elapsed = perf_counter()
     end_process = process_time()
-    log.info(f"Elapsed time: {end_elapsed - start_elapsed}")
-    log.info(f"Process time: {end_process - start_process}")
+    log.info(f"Kernel elapsed time: {end_elapsed - start_elapsed}")
+    log.info(f"Kernel process time: {end_process - start_process}")
 
+    # matplotlib can only plot arrays in host memory
+    if use_gpu:
+        axis_x, axis_y, grid_z = axis_x.get(), axis_y.get(), grid_z.get()
 
     figure(figsize=(10, 10), dpi=100)
-    contour(grid_x, grid_y, grid_z, 500)
+    contour(axis_x, axis_y, grid_z, 500)
     colorbar()
     show()
 
@@ -1,11 +1,23 @@
-from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget
+from PyQt6.QtWidgets import QApplication, QDoubleSpinBox, QFormLayout, QMainWindow, QVBoxLayout, QWidget
 import PyQt6.QtGui as QtG
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
 from sys import argv
 
+from Simulation.gravitational_potential import gravity_potential, grid_axis
+
 
 class MainWindow(QMainWindow):
-    def __int__(self) -> None:
+    # The background colour is the same for every window, so it is only created once
+    _BG_COLOR = QtG.QColor(0, 0, 139, 255)
+
+    # Number of points along each axis of the plotted grid, the extent of the grid in each direction from the
+    # barycentre and the number of contour levels drawn
+    _GRID_POINTS = 200
+    _GRID_LIMIT = 1.5
+    _CONTOUR_LEVELS = 500
+
+    def __init__(self) -> None:
         """
         Creates the main window of the application
 
@@ -16,10 +28,105 @@ class MainWindow(QMainWindow):
         # Set basic dimensions and attributes
         self.setWindowTitle("SPARC Visualizer")
         self.setGeometry(100, 100, 600, 600)
-        self.centralWidget = QWidget()
-        palette = self.centralWidget.palette()
-        palette.setColor(self.centralWidget.backgroundRole(), QtG.QColor(0, 0, 139, 255))
-        self.centralWidget.setPalette(palette)
+        central_widget = QWidget()
+        palette = central_widget.palette()
+        palette.setColor(central_widget.backgroundRole(), self._BG_COLOR)
+        central_widget.setPalette(palette)
+        central_widget.setAutoFillBackground(True)
+        self.setCentralWidget(central_widget)
+
+        # The plot is embedded in the window rather than shown with pyplot, so that it can be redrawn in place whenever
+        # the parameters of the 3 body system change. The limits of the axes are fixed so that the contours can be
+        # redrawn on their own without the rest of the axes having to be redrawn with them
+        self._axis = grid_axis(self._GRID_POINTS, -self._GRID_LIMIT, self._GRID_LIMIT)
+        figure = Figure(figsize=(6, 6), dpi=100)
+        self._axes = figure.add_subplot()
+        self._axes.set_xlim(-self._GRID_LIMIT, self._GRID_LIMIT)
+        self._axes.set_ylim(-self._GRID_LIMIT, self._GRID_LIMIT)
+        self._axes.set_aspect("equal")
+        self._axes.set_autoscale_on(False)
+        self._canvas = FigureCanvasQTAgg(figure)
+        self._canvas.mpl_connect("draw_event", self._on_draw)
+        self._background = None
+        self._contours = None
+
+        self._m1_input = self._parameter_input(2)
+        self._m2_input = self._parameter_input(0.5)
+        self._orbital_radius_input = self._parameter_input(1)
+        parameters = QFormLayout()
+        parameters.addRow("Mass of m1", self._m1_input)
+        parameters.addRow("Mass of m2", self._m2_input)
+        parameters.addRow("Orbital radius of m2", self._orbital_radius_input)
+
+        layout = QVBoxLayout(central_widget)
+        layout.addWidget(self._canvas)
+        layout.addLayout(parameters)
+
+        for parameter_input in (self._m1_input, self._m2_input, self._orbital_radius_input):
+            parameter_input.valueChanged.connect(self._update_potential)
+        self._update_potential()
+
+    @staticmethod
+    def _parameter_input(value: float) -> QDoubleSpinBox:
+        """
+        Creates an input field for one of the parameters of the 3 body system
+
+        :param value: initial value of the parameter
+
+        :return: the input field
+        """
+        parameter_input = QDoubleSpinBox()
+        parameter_input.setDecimals(3)
+        parameter_input.setRange(0.001, 1000)
+        parameter_input.setSingleStep(0.1)
+        parameter_input.setValue(value)
+
+        return parameter_input
+
+    def _on_draw(self, event) -> None:
+        """
+        Stores the empty axes after every full redraw of the figure, such as when the window is resized, so that the
+        contours can later be blitted onto them, and then draws the contours on top
+
+        :param event: draw event emitted by the canvas
+
+        :return: None
+        """
+        self._background = self._canvas.copy_from_bbox(self._axes.bbox)
+        if self._contours is not None:
+            self._axes.draw_artist(self._contours)
+
+    def _update_potential(self) -> None:
+        """
+        Evaluates the gravitational potential for the current parameters of the 3 body system and redraws its contours.
+        Only the contours are redrawn, onto the stored image of the empty axes, rather than the whole figure.
+
+        :return: None
+        """
+        try:
+            grid_z = gravity_potential(self._m1_input.value(), self._m2_input.value(),
+                                       self._orbital_radius_input.value(), self._axis, self._axis)
+        except ValueError as error:
+            self.statusBar().showMessage(str(error))
+            return
+
+        self.statusBar().clearMessage()
+
+        # The contour lines have to be traced again for the new field, so the old contours are replaced rather than
+        # updated. Animated artists are left out of full redraws of the figure and are only drawn when blitting
+        if self._contours is not None:
+            self._contours.remove()
+        self._contours = self._axes.contour(self._axis, self._axis, grid_z, self._CONTOUR_LEVELS)
+        self._contours.set_animated(True)
+
+        if self._background is None:
+            # Nothing has been drawn yet, so the first full draw stores the background and draws the contours
+            self._canvas.draw_idle()
+            return
+
+        self._canvas.restore_region(self._background)
+        self._axes.draw_artist(self._contours)
+        self._canvas.blit(self._axes.bbox)
 
 
 if __name__ == '__main__':